@@ -33,16 +33,19 @@ Author: Healthcare Flow Bot - Text Testing Mode
 
 import os
 import sys
+import gzip
+import hashlib
 import asyncio
 import argparse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import orjson
 from dotenv import load_dotenv
 from loguru import logger
 
 # FastAPI
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from contextlib import asynccontextmanager
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
@@ -76,10 +79,37 @@ from services.config import config
 from pipeline.components import create_llm_service, create_context_aggregator
 from flows.manager import initialize_flow_manager
 from services.transcript_manager import get_transcript_manager, cleanup_transcript_manager
+from utils.text_stream import TextChunkCoalescer
 
 # Load environment variables
 load_dotenv(override=True)
 
+# Inbound payloads above this size are parsed off the event loop
+LARGE_PAYLOAD_BYTES = 8 * 1024
+
+# Upper bound on pipeline teardown when a client disconnects (seconds)
+PIPELINE_SHUTDOWN_TIMEOUT = 2.0
+
+
+async def receive_message(websocket: WebSocket) -> Dict[str, Any]:
+    """
+    Read one WebSocket frame and parse it with orjson
+
+    Accepts text or binary frames as-is (no intermediate str decode for bytes).
+    Raises WebSocketDisconnect like receive_text() when the client goes away.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    data = message.get("bytes")
+    if data is None:
+        data = message.get("text", "")
+
+    if len(data) > LARGE_PAYLOAD_BYTES:
+        return await asyncio.to_thread(orjson.loads, data)
+    return orjson.loads(data)
+
 
 class TextInputProcessor(FrameProcessor):
     """
@@ -104,17 +134,37 @@ class TextOutputProcessor(FrameProcessor):
     """
     Processor that captures LLM text output and sends to WebSocket
     Also records transcript for both transcript_manager and call_extractor
+
+    Streamed chunks are coalesced: pending text is flushed as one WebSocket
+    frame after FLUSH_INTERVAL seconds or once it reaches FLUSH_CHARS.
     """
 
+    FLUSH_INTERVAL = 0.015  # seconds
+    FLUSH_CHARS = 32
+
     def __init__(self, websocket: WebSocket, session_id: str, flow_manager=None):
         super().__init__()
         self.websocket = websocket
         self.session_id = session_id
         self.flow_manager = flow_manager  # Will be set later
-        self._buffer = ""
+        self._parts: List[str] = []  # Full response so far, joined once on completion
+        self._coalescer = TextChunkCoalescer(self._send_chunk, self.FLUSH_INTERVAL, self.FLUSH_CHARS)
+        # Outbound messages reuse one dict per type; only "text" changes per send
+        self._chunk_msg = {"type": "assistant_message_chunk", "text": ""}
+        self._complete_msg = {"type": "assistant_message_complete", "text": ""}
         self._trace_id_captured = False  # Flag to capture trace ID once
         logger.info("💬 TextOutputProcessor initialized")
 
+    async def _send_chunk(self, text: str):
+        """Send coalesced chunks as a single WebSocket frame"""
+        try:
+            self._chunk_msg["text"] = text
+            await self.websocket.send_bytes(orjson.dumps(self._chunk_msg))
+            # Lazy: fires per flush, so skip slicing/formatting unless DEBUG is enabled
+            logger.opt(lazy=True).debug("📤 Sent text chunk to browser: {}...", lambda: text[:50])
+        except Exception as e:
+            logger.error(f"❌ Failed to send text chunk: {e}")
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Process outgoing frames and send text to WebSocket"""
         # CRITICAL: Call super() first to properly initialize the processor
@@ -149,45 +199,46 @@ class TextOutputProcessor(FrameProcessor):
         # NOT upstream text (user input)
         if isinstance(frame, TextFrame) and direction == FrameDirection.DOWNSTREAM:
             text = frame.text
-            self._buffer += text
+            self._parts.append(text)
 
-            # Send partial response to WebSocket for streaming effect
-            try:
-                await self.websocket.send_json({
-                    "type": "assistant_message_chunk",
-                    "text": text
-                })
-                logger.debug(f"📤 Sent text chunk to browser: {text[:50]}...")
-            except Exception as e:
-                logger.error(f"❌ Failed to send text chunk: {e}")
+            # Queue partial response for streaming effect (flushed in batches)
+            await self._coalescer.add(text)
 
         # When LLM finishes, send complete message and record in transcript
-        elif isinstance(frame, (LLMFullResponseEndFrame, EndFrame)) and self._buffer:
+        elif isinstance(frame, (LLMFullResponseEndFrame, EndFrame)) and self._parts:
+            # Drain pending chunks first so the stream stays ordered
+            await self._coalescer.flush()
+            full_text = "".join(self._parts)
             try:
-                await self.websocket.send_json({
-                    "type": "assistant_message_complete",
-                    "text": self._buffer
-                })
-                logger.info(f"✅ Complete message sent: {self._buffer[:100]}...")
+                self._complete_msg["text"] = full_text
+                await self.websocket.send_bytes(orjson.dumps(self._complete_msg))
+                logger.opt(lazy=True).info("✅ Complete message sent: {}...", lambda: full_text[:100])
 
                 # Record assistant message in transcript_manager (for booking agent)
                 from services.transcript_manager import get_transcript_manager
                 session_transcript_manager = get_transcript_manager(self.session_id)
-                session_transcript_manager.add_assistant_message(self._buffer)
+                session_transcript_manager.add_assistant_message(full_text)
 
                 # ALSO add to call_extractor (ALWAYS - Lombardy mode uses info agent only)
                 if self.flow_manager:
                     call_extractor_instance = self.flow_manager.state.get("call_extractor")
                     if call_extractor_instance:
-                        call_extractor_instance.add_transcript_entry("assistant", self._buffer)
+                        call_extractor_instance.add_transcript_entry("assistant", full_text)
                         logger.debug(f"📊 Added to call_extractor: assistant")
 
-                self._buffer = ""
+                self._parts.clear()
             except Exception as e:
                 logger.error(f"❌ Failed to send complete message: {e}")
 
         await self.push_frame(frame, direction)
 
+    async def cleanup(self):
+        """Cleanup when processor is destroyed"""
+        # No flush timer or task may outlive the session
+        self._coalescer.cancel()
+
+        await super().cleanup()
+
 
 class TextTransportSimulator(FrameProcessor):
     """
@@ -195,12 +246,17 @@ class TextTransportSimulator(FrameProcessor):
     Acts as both input and output processor
     """
 
-    def __init__(self, websocket: WebSocket):
+    MAX_QUEUED_MESSAGES = 32
+
+    def __init__(self, websocket: WebSocket, loop: Optional[asyncio.AbstractEventLoop] = None):
         super().__init__()
         self.websocket = websocket
+        self._loop = loop or asyncio.get_running_loop()
         self._running = True
         self._started = False
-        self._message_queue = asyncio.Queue()
+        # Bounded so a flood of sends (or a stalled pipeline) can't grow memory without limit
+        self._message_queue = asyncio.Queue(maxsize=self.MAX_QUEUED_MESSAGES)
+        self._consumer_task: Optional[asyncio.Task] = None
         logger.info("🔌 TextTransportSimulator initialized")
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
@@ -213,8 +269,10 @@ class TextTransportSimulator(FrameProcessor):
             self._started = True
             logger.info("✅ TextTransportSimulator received StartFrame - ready to process messages")
 
-            # Start processing queued messages
-            asyncio.create_task(self._process_message_queue())
+            # Start processing queued messages (once: a re-issued StartFrame must
+            # not add a second consumer racing on the same queue)
+            if self._consumer_task is None:
+                self._consumer_task = asyncio.create_task(self._process_message_queue())
 
         # Push frame downstream
         await self.push_frame(frame, direction)
@@ -222,36 +280,58 @@ class TextTransportSimulator(FrameProcessor):
     async def _process_message_queue(self):
         """Process messages from the queue after pipeline has started"""
         while self._running:
+            # Block until a message arrives; stop() cancels the task to end it
+            text, received_at = await self._message_queue.get()
             try:
-                text = await asyncio.wait_for(self._message_queue.get(), timeout=1.0)
                 if text:
-                    logger.info(f"📥 Processing queued message: {text}")
-
-                    # Use TranscriptionFrame (like STT does) instead of TextFrame
-                    # This way the context aggregator knows it's user input
-                    transcription_frame = TranscriptionFrame(text=text, user_id="user", timestamp=0)
-                    await self.push_frame(transcription_frame)
-
-                    # Also notify that user "started speaking" and "stopped speaking"
-                    # This helps with conversation flow timing
-                    await self.push_frame(UserStartedSpeakingFrame())
-                    await self.push_frame(UserStoppedSpeakingFrame())
+                    queued_ms = (self._loop.time() - received_at) * 1000
+                    logger.info(f"📥 Processing queued message ({queued_ms:.1f} ms in queue): {text}")
+                    await self._push_user_turn(text)
 
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 logger.error(f"❌ Error processing message from queue: {e}")
 
-    async def receive_text_message(self, text: str):
+    async def _push_user_turn(self, text: str):
+        """
+        Push one user turn downstream as a single unit
+
+        Uses TranscriptionFrame (like STT does) instead of TextFrame so the
+        context aggregator knows it's user input, followed by the user
+        "started speaking"/"stopped speaking" pair that drives flow timing.
+        The pushes stay sequential: downstream processors rely on this order.
+        """
+        for frame in (
+            TranscriptionFrame(text=text, user_id="user", timestamp=0),
+            UserStartedSpeakingFrame(),
+            UserStoppedSpeakingFrame(),
+        ):
+            await self.push_frame(frame)
+
+    async def receive_text_message(self, text: str) -> bool:
         """
         Receive text message from WebSocket and queue it for processing
+
+        Returns True if the message was queued, False if it was rejected
+        because the queue is full (the client is told the agent is busy).
         """
         logger.info(f"📨 Queueing user message: {text}")
-        await self._message_queue.put(text)
+        try:
+            self._message_queue.put_nowait((text, self._loop.time()))
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ Message queue full ({self.MAX_QUEUED_MESSAGES}), rejecting: {text}")
+            await self.websocket.send_bytes(orjson.dumps({
+                "type": "error",
+                "text": "Agent is busy, please wait for the current reply"
+            }))
+            return False
+        return True
 
     def stop(self):
         """Stop the transport"""
         self._running = False
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+            self._consumer_task = None
 
 
 async def report_to_talkdesk(flow_manager, call_extractor):
@@ -376,10 +456,8 @@ global_caller_phone = None
 global_patient_dob = None
 
 
-@app.get("/")
-async def root():
-    """Serve the chat interface HTML"""
-    html_content = """
+# Chat UI page, encoded once at import and served as-is on every GET
+CHAT_UI_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -782,6 +860,7 @@ async def root():
         let ws = null;
         let isConnected = false;
         let currentAssistantMessage = '';
+        const textDecoder = new TextDecoder();
 
         const messagesContainer = document.getElementById('messagesContainer');
         const messageInput = document.getElementById('messageInput');
@@ -796,6 +875,7 @@ async def root():
 
             console.log('Connecting to:', wsUrl);
             ws = new WebSocket(wsUrl);
+            ws.binaryType = 'arraybuffer';  // Server sends orjson-encoded binary frames
 
             ws.onopen = () => {
                 console.log('WebSocket connected');
@@ -810,7 +890,7 @@ async def root():
             };
 
             ws.onmessage = (event) => {
-                const data = JSON.parse(event.data);
+                const data = JSON.parse(textDecoder.decode(event.data));
                 console.log('Received:', data);
 
                 if (data.type === 'system_ready') {
@@ -834,6 +914,10 @@ async def root():
                     currentAssistantMessage = '';
                     addMessage('assistant', data.text);
                 }
+                else if (data.type === 'error') {
+                    // Server rejected the message (e.g. queue full)
+                    addSystemMessage(`⚠️ ${data.text}`);
+                }
             };
 
             ws.onclose = () => {
@@ -986,7 +1070,37 @@ async def root():
 </body>
 </html>
     """
-    return HTMLResponse(content=html_content)
+_CHAT_UI_BYTES = CHAT_UI_HTML.encode("utf-8")
+# Compressed once at import (mostly repetitive CSS), so no per-request gzip work
+_CHAT_UI_GZIP = gzip.compress(_CHAT_UI_BYTES, compresslevel=9, mtime=0)
+# Validators computed once from the page bytes; each encoding gets its own ETag
+_CHAT_UI_ETAG = f'"{hashlib.sha256(_CHAT_UI_BYTES).hexdigest()[:16]}"'
+_CHAT_UI_GZIP_ETAG = f'{_CHAT_UI_ETAG[:-1]}-gzip"'
+_CHAT_UI_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """True if an If-None-Match header value matches the given ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+@app.get("/")
+async def root(request: Request):
+    """Serve the chat interface HTML (304 when the browser's cached copy is current)"""
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    etag = _CHAT_UI_GZIP_ETAG if use_gzip else _CHAT_UI_ETAG
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": _CHAT_UI_CACHE_CONTROL, "ETag": etag}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=_CHAT_UI_GZIP, media_type="text/html; charset=utf-8", headers=headers)
+    return Response(content=_CHAT_UI_BYTES, media_type="text/html; charset=utf-8", headers=headers)
 
 
 @app.get("/health")
@@ -1011,6 +1125,9 @@ async def websocket_endpoint(websocket: WebSocket):
 
     await websocket.accept()
 
+    # Looked up once per session; shared with the transport for message timestamps
+    loop = asyncio.get_running_loop()
+
     # ✅ Use existing Supabase UUID for testing (row already created with bridge data)
     session_id = "49b78a42-9024-4646-95e2-d2d6f4f8a17b"
 
@@ -1047,7 +1164,7 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.info("✅ LLM and context aggregator initialized (no STT/TTS)")
 
         # CREATE TEXT TRANSPORT SIMULATOR
-        text_transport = TextTransportSimulator(websocket)
+        text_transport = TextTransportSimulator(websocket, loop)
         text_output = TextOutputProcessor(websocket, session_id)
 
         # CREATE PIPELINE (TEXT-ONLY - NO STT/TTS!)
@@ -1142,7 +1259,7 @@ async def websocket_endpoint(websocket: WebSocket):
         # Store session
         active_sessions[session_id] = {
             "websocket": websocket,
-            "connected_at": asyncio.get_event_loop().time(),
+            "connected_at": loop.time(),
             "call_logger": session_call_logger,
             "mode": "text-only",
             "flow_manager": flow_manager,
@@ -1155,10 +1272,10 @@ async def websocket_endpoint(websocket: WebSocket):
             logger.success(f"✅ Flow initialized with {global_start_node} node")
 
             # Notify client that system is ready
-            await websocket.send_json({
+            await websocket.send_bytes(orjson.dumps({
                 "type": "system_ready",
                 "start_node": global_start_node
-            })
+            }))
         except Exception as e:
             logger.error(f"Error during flow initialization: {e}")
 
@@ -1176,13 +1293,18 @@ async def websocket_endpoint(websocket: WebSocket):
         try:
             while True:
                 # Receive message from WebSocket
-                message = await websocket.receive_json()
+                message = await receive_message(websocket)
 
                 if message.get("type") == "user_message":
                     user_text = message.get("text", "").strip()
                     if user_text:
                         logger.info(f"💬 User: {user_text}")
 
+                        # Send to pipeline; a message rejected by the full queue
+                        # never reached the agent, so it must not be recorded
+                        if not await text_transport.receive_text_message(user_text):
+                            continue
+
                         # Record in transcript_manager (for booking agent)
                         session_transcript_manager.add_user_message(user_text)
 
@@ -1192,22 +1314,28 @@ async def websocket_endpoint(websocket: WebSocket):
                             call_extractor_instance.add_transcript_entry("user", user_text)
                             logger.debug(f"📊 Added to call_extractor: user")
 
-                        # Send to pipeline
-                        await text_transport.receive_text_message(user_text)
-
         except WebSocketDisconnect:
             logger.info(f"🔌 Text chat client disconnected: {session_id}")
         except Exception as e:
             logger.error(f"❌ Error in message loop: {e}")
         finally:
-            # Cancel pipeline
-            if pipeline_task:
+            # Cancel pipeline: stop the PipelineTask and join the runner in parallel,
+            # bounded so a stuck processor can't hold the session (and its memory) open
+            async def _cancel_runner():
                 pipeline_task.cancel()
                 try:
                     await pipeline_task
                 except asyncio.CancelledError:
                     pass
 
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(_cancel_runner(), task.cancel(), return_exceptions=True),
+                    timeout=PIPELINE_SHUTDOWN_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Pipeline shutdown exceeded {PIPELINE_SHUTDOWN_TIMEOUT}s for session: {session_id}")
+
     except Exception as e:
         logger.error(f"❌ Error in Text Chat WebSocket handler: {e}")
         import traceback
@@ -1306,6 +1434,10 @@ async def websocket_endpoint(websocket: WebSocket):
         except Exception as e:
             logger.error(f"❌ Error stopping call logging: {e}")
 
+        # Release the queue consumer blocked on get()
+        if text_transport:
+            text_transport.stop()
+
         # Cancel task
         if task:
             await task.cancel()
@@ -1406,7 +1538,16 @@ def main():
     logger.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
     import uvicorn
-    uvicorn.run(app, host=args.host, port=8004, reload=False)
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=8004,
+        reload=False,
+        loop="uvloop",       # Faster event loop for WebSocket send/receive
+        http="httptools",    # C HTTP parser instead of h11
+        ws="websockets",
+        ws_per_message_deflate=False  # Chat frames are tiny; compression only adds latency
+    )
 
 
 if __name__ == "__main__":
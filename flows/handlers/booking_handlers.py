@@ -4,7 +4,6 @@ Booking and slot management flow handlers
 
 import re
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 from typing import Dict, Any, Tuple, List
 from loguru import logger
 
@@ -14,6 +13,7 @@ from services.slotAgenda import list_slot, create_slot, delete_slot
 from models.requests import HealthService, HealthCenter
 from services.llm_interpretation import interpret_sorting_scenario
 from config.settings import settings
+from services.timezone_utils import ITALIAN_TZ
 
 
 async def search_final_centers_and_transition(args: FlowArgs, flow_manager: FlowManager) -> Tuple[Dict[str, Any], NodeConfig]:
@@ -444,9 +444,7 @@ async def collect_datetime_and_transition(args: FlowArgs, flow_manager: FlowMana
         # Handle "FIRST AVAILABLE" mode - USE TOMORROW'S DATE
         if first_available_mode:
             # Calculate tomorrow's date in Italian timezone
-            from zoneinfo import ZoneInfo
-            italian_tz = ZoneInfo("Europe/Rome")
-            today = datetime.now(italian_tz)
+            today = datetime.now(ITALIAN_TZ)
             tomorrow = today + timedelta(days=1)
             tomorrow_date = tomorrow.strftime('%Y-%m-%d')
 
@@ -1462,7 +1460,6 @@ async def perform_slot_booking_and_transition(args: FlowArgs, flow_manager: Flow
                     # Calculate automatic date/time: same date, +1 hour from first service end
                     try:
                         from datetime import datetime, timedelta
-                        from zoneinfo import ZoneInfo
 
                         # Parse first service end time (UTC)
                         first_end_dt = datetime.fromisoformat(first_slot_end_time.replace('Z', '+00:00'))
@@ -1475,8 +1472,7 @@ async def perform_slot_booking_and_transition(args: FlowArgs, flow_manager: Flow
                         auto_time = auto_start_dt.strftime("%H:%M")
 
                         # Convert to Italian time for user display
-                        italian_tz = ZoneInfo("Europe/Rome")
-                        auto_start_italian = auto_start_dt.astimezone(italian_tz)
+                        auto_start_italian = auto_start_dt.astimezone(ITALIAN_TZ)
                         auto_time_italian = auto_start_italian.strftime("%H:%M")
 
                         flow_manager.state["auto_date"] = auto_date
@@ -1797,7 +1793,6 @@ async def show_more_same_day_slots_handler(args: FlowArgs, flow_manager: FlowMan
 
         # Parse all cached slots and find the earliest date
         from datetime import datetime
-        from zoneinfo import ZoneInfo
 
         all_slots_with_dt = []
         for slot in cached_slots:
@@ -1809,7 +1804,7 @@ async def show_more_same_day_slots_handler(args: FlowArgs, flow_manager: FlowMan
                     continue
 
                 slot_dt = datetime.fromisoformat(slot_datetime_str.replace('Z', '+00:00'))
-                slot_dt_local = slot_dt.astimezone(ZoneInfo("Europe/Rome"))
+                slot_dt_local = slot_dt.astimezone(ITALIAN_TZ)
 
                 all_slots_with_dt.append({
                     'slot_data': slot,
@@ -4,12 +4,12 @@ Booking and appointment management nodes
 
 import json
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 from typing import Dict, Any, List
 from pipecat_flows import NodeConfig, FlowsFunctionSchema
 from loguru import logger
 
 from models.requests import HealthService, HealthCenter
+from services.timezone_utils import ITALIAN_TZ
 
 # Global variable to store current session's filtered slots for UUID lookup
 _current_session_slots = {}
@@ -543,8 +543,7 @@ def create_slot_selection_node(slots: List[Dict], service: HealthService, is_cer
         logger.info("🎯 FIRST AVAILABLE MODE: Sending ALL slots from earliest available date (TOMORROW)")
 
         # Get tomorrow's date in Italian timezone (API already searched from tomorrow)
-        italian_tz = ZoneInfo("Europe/Rome")
-        today_dt = datetime.now(italian_tz)
+        today_dt = datetime.now(ITALIAN_TZ)
         tomorrow_dt = today_dt + timedelta(days=1)
         tomorrow_date_key = tomorrow_dt.strftime('%Y-%m-%d')
 
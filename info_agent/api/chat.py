@@ -5,7 +5,7 @@ Uses the SAME LLM and flows as WebSocket agent, based on chat_test.py
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from loguru import logger
 from datetime import datetime
 import asyncio
@@ -19,7 +19,7 @@ from pipecat.frames.frames import (
     TextFrame,
     LLMTextFrame,
     LLMFullResponseEndFrame,
-    EndFrame
+    FunctionCallResultFrame
 )
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
@@ -53,15 +53,23 @@ class ChatResponse(BaseModel):
 
 class TextInputProcessor(FrameProcessor):
     """Convert text to transcription frames"""
+
+    USER_ID = "api_user"
+
+    def __init__(self):
+        super().__init__()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # Resolved on the first frame
     
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
         
         if isinstance(frame, TextFrame):
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
             transcription = TranscriptionFrame(
                 text=frame.text,
-                user_id="api_user",
-                timestamp=asyncio.get_event_loop().time()
+                user_id=self.USER_ID,
+                timestamp=self._loop.time()
             )
             await self.push_frame(transcription, direction)
         else:
@@ -73,7 +81,8 @@ class TextOutputCapture(FrameProcessor):
     
     def __init__(self):
         super().__init__()
-        self.response_text = ""
+        self._parts: List[str] = []  # Joined once when the response is read
+        self._chars = 0
         self.got_response = asyncio.Event()
         self.response_count = 0
         self.function_called = False
@@ -81,26 +90,30 @@ class TextOutputCapture(FrameProcessor):
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
         
-        from pipecat.frames.frames import FunctionCallResultFrame
-        
         if isinstance(frame, FunctionCallResultFrame):
             self.function_called = True
             logger.debug("✅ Function result received, waiting for final LLM response...")
         elif isinstance(frame, LLMTextFrame):
-            self.response_text += frame.text
+            self._parts.append(frame.text)
+            self._chars += len(frame.text)
         elif isinstance(frame, LLMFullResponseEndFrame):
             self.response_count += 1
-            logger.debug(f"📝 LLM response #{self.response_count}, text so far: {len(self.response_text)} chars")
+            logger.debug(f"📝 LLM response #{self.response_count}, text so far: {self._chars} chars")
             
             # If function was called, wait for second response (after function result)
             # Otherwise, first response is the final one
             if (self.function_called and self.response_count >= 2) or (not self.function_called and self.response_count >= 1):
-                if self.response_text:
-                    logger.debug(f"✅ Got final response: {len(self.response_text)} chars")
+                if self._chars:
+                    logger.debug(f"✅ Got final response: {self._chars} chars")
                     self.got_response.set()
         
         await self.push_frame(frame, direction)
 
+    @property
+    def response_text(self) -> str:
+        """Full captured response text"""
+        return "".join(self._parts)
+
 
 @router.post("/send", response_model=ChatResponse)
 async def send_chat_message(
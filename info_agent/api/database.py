@@ -4,6 +4,7 @@ Uses asyncpg for async PostgreSQL operations
 """
 
 import os
+import ssl
 import asyncpg
 from typing import Optional, List, Dict, Any
 from loguru import logger
@@ -23,15 +24,25 @@ class Database:
                 raise ValueError("DATABASE_URL environment variable not set")
 
             # Supabase requires SSL connections
-            import ssl
             ssl_context = ssl.create_default_context()
             ssl_context.check_hostname = False
             ssl_context.verify_mode = ssl.CERT_NONE
 
+            # Per-process pool size; with N agent replicas/workers keep N * max_size
+            # within the Supabase pooler budget (DB_POOL_MAX_SIZE overrides)
+            min_size = int(os.getenv("DB_POOL_MIN_SIZE", "10"))
+            max_size = int(os.getenv("DB_POOL_MAX_SIZE", "50"))
+            if max_size < min_size:
+                logger.warning(
+                    f"⚠️ DB_POOL_MAX_SIZE={max_size} is below DB_POOL_MIN_SIZE={min_size}; "
+                    f"using max_size={min_size} instead"
+                )
+                max_size = min_size
+
             self.pool = await asyncpg.create_pool(
                 dsn=database_url,
-                min_size=10,          # Increased from 5 to handle concurrent calls
-                max_size=50,          # Increased from 20 to support 30-40 concurrent calls
+                min_size=min_size,    # Default 10 to handle concurrent calls
+                max_size=max_size,    # Default 50 to support 30-40 concurrent calls
                 command_timeout=60,
                 ssl=ssl_context,
                 statement_cache_size=0  # Required for Supabase connection pooler
@@ -41,7 +52,7 @@ class Database:
             async with self.pool.acquire() as conn:
                 await conn.fetchval("SELECT 1")
 
-            logger.info("✅ PostgreSQL connection pool created successfully (SSL enabled)")
+            logger.info(f"✅ PostgreSQL connection pool created successfully (SSL enabled, size {min_size}-{max_size})")
 
         except Exception as e:
             logger.error(f"❌ Failed to connect to PostgreSQL: {e}")
@@ -2,29 +2,43 @@
 Info Agent Chat Test Interface
 Text-only testing interface for rapid development and testing
 Based on booking agent's working chat_test.py structure
+
+Run from the repository root as a module (no sys.path changes needed):
+    python -m info_agent.chat_test
 """
 
 import os
+import re
 import sys
+import uuid
+import gzip
 import asyncio
 import argparse
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from time import monotonic
+from typing import Dict, Any, List, Optional
+from contextlib import asynccontextmanager
+import orjson
 from dotenv import load_dotenv
 from loguru import logger
 
-# Add parent directory to path for booking agent imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Only a direct script run (python info_agent/chat_test.py) lacks the repo root on
+# sys.path; as a module it's already there, so don't prepend a duplicate entry that
+# every later import miss would have to scan first
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.websockets import WebSocketState
+from fastapi.responses import JSONResponse, Response
 
 # Pipecat imports
 from pipecat.frames.frames import (
     Frame,
     TextFrame,
     TranscriptionFrame,
-    LLMMessagesFrame,
     LLMFullResponseEndFrame,
     EndFrame,
     StartFrame,
@@ -32,22 +46,55 @@ from pipecat.frames.frames import (
     UserStoppedSpeakingFrame
 )
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
-from pipecat.pipeline.pipeline import Pipeline
-from pipecat.pipeline.runner import PipelineRunner
-from pipecat.pipeline.task import PipelineParams, PipelineTask
-
-# Import flow management
-from info_agent.flows.manager import create_flow_manager, initialize_flow_manager
-from info_agent.config.settings import info_settings
-
-# Reuse components from booking agent
-from pipeline.components import (
-    create_llm_service,
-    create_context_aggregator
-)
+
+from utils.text_stream import TextChunkCoalescer
+
+# Pipeline runtime, flow management and the booking agent's LLM components are
+# imported where first used, so --help never loads them. When the server runs, the
+# lifespan loads them in a background pre-warm, so the UI page and /health are
+# served without waiting on those imports
 
 load_dotenv(override=True)
 
+# The browser always sends JSON.stringify({type: 'user_message', text}), so match
+# that exact shape directly; anything else (escapes, other types) goes through orjson
+_USER_MSG_RE = re.compile(rb'\{"type":"user_message","text":"([^"\\]*)"\}')
+
+
+@lru_cache(maxsize=None)
+def system_ready_frame(start_node: str) -> bytes:
+    """Encoded system_ready message; constant per start node, so built once"""
+    return orjson.dumps({"type": "system_ready", "start_node": start_node})
+
+
+async def receive_frame(websocket: WebSocket) -> bytes:
+    """
+    Read one WebSocket frame as bytes
+
+    Accepts binary frames as-is and text frames (older clients still send
+    JSON.stringify(...) strings). Raises WebSocketDisconnect when the client goes away.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    data = message.get("bytes")
+    if data is None:
+        data = message.get("text", "").encode("utf-8")
+    return data
+
+
+def parse_user_message(data: bytes) -> Optional[str]:
+    """Extract the user text from an inbound WebSocket frame (None if not a user message)"""
+    match = _USER_MSG_RE.fullmatch(data)
+    if match:
+        return match.group(1).decode("utf-8")
+
+    message = orjson.loads(data)
+    if message.get("type") == "user_message":
+        return message.get("text", "")
+    return None
+
 
 class TextInputProcessor(FrameProcessor):
     """
@@ -71,49 +118,91 @@ class TextInputProcessor(FrameProcessor):
 class TextOutputProcessor(FrameProcessor):
     """
     Processor that captures LLM text output and sends to WebSocket
+
+    Streamed chunks are coalesced: pending text is flushed as one WebSocket
+    frame after FLUSH_INTERVAL seconds or once it reaches FLUSH_CHARS.
     """
 
+    FLUSH_INTERVAL = 0.015  # seconds
+    FLUSH_CHARS = 32
+
     def __init__(self, websocket: WebSocket):
         super().__init__()
         self.websocket = websocket
-        self._buffer = ""
+        self._parts: List[str] = []  # Full response so far, joined once on completion
+        self._coalescer = TextChunkCoalescer(self._send_chunk, self.FLUSH_INTERVAL, self.FLUSH_CHARS)
+        # Outbound messages reuse one dict per type; only "text" changes per send
+        self._chunk_msg = {"type": "assistant_message_chunk", "text": ""}
+        self._complete_msg = {"type": "assistant_message_complete", "text": ""}
+        self._closed = False
         logger.info("💬 TextOutputProcessor initialized")
 
+    def _update_closed(self):
+        """After a failed send, stop sending if the WebSocket is no longer connected"""
+        self._closed = (
+            self.websocket.client_state != WebSocketState.CONNECTED
+            or self.websocket.application_state != WebSocketState.CONNECTED
+        )
+        if self._closed:
+            # Nothing more can be sent: drop pending chunks and any scheduled flush
+            self._coalescer.cancel()
+
+    async def _send_chunk(self, text: str):
+        """Send coalesced chunks as a single WebSocket frame"""
+        if self._closed:
+            return
+
+        try:
+            self._chunk_msg["text"] = text
+            await self.websocket.send_bytes(orjson.dumps(self._chunk_msg))
+            # Lazy: fires per flush, so skip slicing/formatting unless DEBUG is enabled
+            logger.opt(lazy=True).debug("📤 Sent text chunk to browser: {}...", lambda: text[:50])
+        except Exception as e:
+            logger.error(f"❌ Failed to send text chunk: {e}")
+            self._update_closed()
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Process outgoing frames and send text to WebSocket"""
         # CRITICAL: Call super() first to properly initialize the processor
         await super().process_frame(frame, direction)
 
+        # Client is gone: just pass frames through instead of failing a send per chunk
+        if self._closed:
+            await self.push_frame(frame, direction)
+            return
+
         # ONLY capture text going DOWNSTREAM (from LLM to output)
         # NOT upstream text (user input)
         if isinstance(frame, TextFrame) and direction == FrameDirection.DOWNSTREAM:
             text = frame.text
-            self._buffer += text
+            self._parts.append(text)
 
-            # Send partial response to WebSocket for streaming effect
-            try:
-                await self.websocket.send_json({
-                    "type": "assistant_message_chunk",
-                    "text": text
-                })
-                logger.debug(f"📤 Sent text chunk to browser: {text[:50]}...")
-            except Exception as e:
-                logger.error(f"❌ Failed to send text chunk: {e}")
+            # Queue partial response for streaming effect (flushed in batches)
+            await self._coalescer.add(text)
 
         # When LLM finishes, send complete message
-        elif isinstance(frame, (LLMFullResponseEndFrame, EndFrame)) and self._buffer:
+        elif isinstance(frame, (LLMFullResponseEndFrame, EndFrame)) and self._parts:
+            # Drain pending chunks first so the stream stays ordered
+            await self._coalescer.flush()
+            full_text = "".join(self._parts)
             try:
-                await self.websocket.send_json({
-                    "type": "assistant_message_complete",
-                    "text": self._buffer
-                })
-                logger.info(f"✅ Complete message sent: {self._buffer[:100]}...")
-                self._buffer = ""
+                self._complete_msg["text"] = full_text
+                await self.websocket.send_bytes(orjson.dumps(self._complete_msg))
+                logger.opt(lazy=True).info("✅ Complete message sent: {}...", lambda: full_text[:100])
+                self._parts.clear()
             except Exception as e:
                 logger.error(f"❌ Failed to send complete message: {e}")
+                self._update_closed()
 
         await self.push_frame(frame, direction)
 
+    async def cleanup(self):
+        """Cleanup when processor is destroyed"""
+        # No flush timer or task may outlive the session
+        self._coalescer.cancel()
+
+        await super().cleanup()
+
 
 class TextTransportSimulator(FrameProcessor):
     """
@@ -121,12 +210,19 @@ class TextTransportSimulator(FrameProcessor):
     Acts as both input and output processor
     """
 
-    def __init__(self, websocket: WebSocket):
+    USER_ID = "user"
+
+    MAX_QUEUED_MESSAGES = 32
+
+    def __init__(self, websocket: WebSocket, loop: Optional[asyncio.AbstractEventLoop] = None):
         super().__init__()
         self.websocket = websocket
+        self._loop = loop or asyncio.get_running_loop()
         self._running = True
         self._started = False
-        self._message_queue = asyncio.Queue()
+        # Bounded so a flood of sends (or a stalled pipeline) can't grow memory without limit
+        self._message_queue = asyncio.Queue(maxsize=self.MAX_QUEUED_MESSAGES)
+        self._consumer_task: Optional[asyncio.Task] = None
         logger.info("🔌 TextTransportSimulator initialized")
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
@@ -139,8 +235,10 @@ class TextTransportSimulator(FrameProcessor):
             self._started = True
             logger.info("✅ TextTransportSimulator received StartFrame - ready to process messages")
 
-            # Start processing queued messages
-            asyncio.create_task(self._process_message_queue())
+            # Start processing queued messages (once: a re-issued StartFrame must
+            # not add a second consumer racing on the same queue)
+            if self._consumer_task is None:
+                self._consumer_task = asyncio.create_task(self._process_message_queue())
 
         # Push frame downstream
         await self.push_frame(frame, direction)
@@ -148,510 +246,117 @@ class TextTransportSimulator(FrameProcessor):
     async def _process_message_queue(self):
         """Process messages from the queue after pipeline has started"""
         while self._running:
+            # Block until a message arrives; stop() cancels the task to end it
+            text, received_at = await self._message_queue.get()
             try:
-                text = await asyncio.wait_for(self._message_queue.get(), timeout=1.0)
                 if text:
-                    logger.info(f"📥 Processing queued message: {text}")
-
-                    # Use TranscriptionFrame (like STT does) instead of TextFrame
-                    # This way the context aggregator knows it's user input
-                    transcription_frame = TranscriptionFrame(text=text, user_id="user", timestamp=0)
-                    await self.push_frame(transcription_frame)
+                    queued_ms = (self._loop.time() - received_at) * 1000
+                    logger.info(f"📥 Processing queued message ({queued_ms:.1f} ms in queue): {text}")
+                    await self._push_user_turn(text)
 
-                    # Also notify that user "started speaking" and "stopped speaking"
-                    # This helps with conversation flow timing
-                    await self.push_frame(UserStartedSpeakingFrame())
-                    await self.push_frame(UserStoppedSpeakingFrame())
-
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 logger.error(f"❌ Error processing message from queue: {e}")
 
+    async def _push_user_turn(self, text: str):
+        """
+        Push one user turn downstream as a single unit
+
+        Uses TranscriptionFrame (like STT does) instead of TextFrame so the
+        context aggregator knows it's user input, followed by the user
+        "started speaking"/"stopped speaking" pair that drives flow timing.
+        The pushes stay sequential: downstream processors rely on this order.
+        """
+        for frame in (
+            TranscriptionFrame(text=text, user_id=self.USER_ID, timestamp=0),
+            UserStartedSpeakingFrame(),
+            UserStoppedSpeakingFrame(),
+        ):
+            await self.push_frame(frame)
+
     async def receive_text_message(self, text: str):
         """
         Receive text message from WebSocket and queue it for processing
         """
         logger.info(f"📨 Queueing user message: {text}")
-        await self._message_queue.put(text)
+        try:
+            self._message_queue.put_nowait((text, self._loop.time()))
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ Message queue full ({self.MAX_QUEUED_MESSAGES}), rejecting: {text}")
+            await self.websocket.send_bytes(orjson.dumps({
+                "type": "error",
+                "text": "Agent is busy, please wait for the current reply"
+            }))
 
     def stop(self):
         """Stop the transport"""
         self._running = False
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+            self._consumer_task = None
+
+
+def _prewarm_greeting_flow():
+    """Import the flow/pipeline modules and warm the greeting path (runs in a worker thread)"""
+    try:
+        from info_agent.flows.manager import prewarm_greeting_path
+        prewarm_greeting_path()
+    except Exception as e:
+        logger.warning(f"⚠️ Greeting pre-warm failed (first session will load lazily): {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the greeting flow in the background so startup isn't blocked on it"""
+    prewarm_task = asyncio.create_task(asyncio.to_thread(_prewarm_greeting_flow))
+    yield
+    if not prewarm_task.done():
+        prewarm_task.cancel()
 
 
 # FastAPI app
 app = FastAPI(
     title="Info Agent - Text Chat Testing",
     description="Text-only chat interface for Info Agent rapid testing",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# CORS configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# No CORS middleware: the chat UI and its WebSocket are served from the same origin
+
+@dataclass(slots=True)
+class ChatSession:
+    """Active text chat session"""
+    websocket: WebSocket
+    connected_at: float
+    flow_manager: Any
+    text_transport: TextTransportSimulator
+    mode: str = "text-only"
+
 
 # Store for active sessions
-active_sessions: Dict[str, Any] = {}
+active_sessions: Dict[str, ChatSession] = {}
 
 # Global config for start node
 global_start_node = "greeting"  # Info agent starts with greeting
 
 
+# Chat UI page lives in static/chat.html; read once at import and served from memory
+_STATIC_DIR = Path(__file__).resolve().parent / "static"
+_CHAT_UI_BYTES = (_STATIC_DIR / "chat.html").read_bytes()
+# Compressed once at import (mostly repetitive CSS), so no per-request gzip work
+_CHAT_UI_GZIP = gzip.compress(_CHAT_UI_BYTES, compresslevel=9, mtime=0)
+
+
 @app.get("/")
-async def get_chat_ui():
+async def get_chat_ui(request: Request):
     """Serve chat test UI"""
-    return HTMLResponse("""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Info Agent Chat Test</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                height: 100vh;
-                display: flex;
-                flex-direction: column;
-            }
-            
-            .header {
-                background: rgba(255,255,255,0.95);
-                padding: 20px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }
-            
-            .header h1 {
-                color: #333;
-                font-size: 24px;
-                margin-bottom: 5px;
-            }
-            
-            .header p {
-                color: #666;
-                font-size: 14px;
-            }
-            
-            .status-bar {
-                background: rgba(255,255,255,0.9);
-                padding: 10px 20px;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                font-size: 12px;
-            }
-            
-            .status-indicator {
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            
-            .status-dot {
-                width: 8px;
-                height: 8px;
-                border-radius: 50%;
-                background: #22c55e;
-                animation: pulse 2s infinite;
-            }
-            
-            @keyframes pulse {
-                0%, 100% { opacity: 1; }
-                50% { opacity: 0.5; }
-            }
-            
-            .chat-container {
-                flex: 1;
-                background: rgba(255,255,255,0.95);
-                margin: 20px;
-                border-radius: 10px;
-                display: flex;
-                flex-direction: column;
-                overflow: hidden;
-                box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-            }
-            
-            .messages {
-                flex: 1;
-                overflow-y: auto;
-                padding: 20px;
-            }
-            
-            .message {
-                margin-bottom: 16px;
-                display: flex;
-                gap: 12px;
-            }
-            
-            .message.user {
-                flex-direction: row-reverse;
-            }
-            
-            .message-bubble {
-                max-width: 70%;
-                padding: 12px 16px;
-                border-radius: 18px;
-                word-wrap: break-word;
-            }
-            
-            .user .message-bubble {
-                background: #667eea;
-                color: white;
-                border-bottom-right-radius: 4px;
-            }
-            
-            .assistant .message-bubble {
-                background: #f1f3f5;
-                color: #333;
-                border-bottom-left-radius: 4px;
-            }
-            
-            .message-icon {
-                width: 36px;
-                height: 36px;
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 18px;
-                flex-shrink: 0;
-            }
-            
-            .user .message-icon {
-                background: #667eea;
-            }
-            
-            .assistant .message-icon {
-                background: #764ba2;
-            }
-            
-            .input-area {
-                padding: 20px;
-                background: white;
-                border-top: 1px solid #e5e7eb;
-            }
-            
-            .input-container {
-                display: flex;
-                gap: 10px;
-            }
-            
-            #messageInput {
-                flex: 1;
-                padding: 12px 16px;
-                border: 2px solid #e5e7eb;
-                border-radius: 24px;
-                font-size: 14px;
-                outline: none;
-                transition: border-color 0.3s;
-            }
-            
-            #messageInput:focus {
-                border-color: #667eea;
-            }
-            
-            #sendButton {
-                padding: 12px 24px;
-                background: #667eea;
-                color: white;
-                border: none;
-                border-radius: 24px;
-                cursor: pointer;
-                font-weight: 600;
-                transition: background 0.3s;
-            }
-            
-            #sendButton:hover {
-                background: #5568d3;
-            }
-            
-            #sendButton:disabled {
-                background: #cbd5e1;
-                cursor: not-allowed;
-            }
-            
-            .typing-indicator {
-                display: none;
-                padding: 12px 16px;
-                background: #f1f3f5;
-                border-radius: 18px;
-                border-bottom-left-radius: 4px;
-                max-width: 70px;
-            }
-            
-            .typing-indicator.active {
-                display: block;
-            }
-            
-            .typing-indicator span {
-                display: inline-block;
-                width: 8px;
-                height: 8px;
-                border-radius: 50%;
-                background: #94a3b8;
-                margin: 0 2px;
-                animation: typing 1.4s infinite;
-            }
-            
-            .typing-indicator span:nth-child(2) {
-                animation-delay: 0.2s;
-            }
-            
-            .typing-indicator span:nth-child(3) {
-                animation-delay: 0.4s;
-            }
-            
-            @keyframes typing {
-                0%, 60%, 100% { transform: translateY(0); }
-                30% { transform: translateY(-10px); }
-            }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🏥 Info Agent - Ualà</h1>
-            <p>Medical Information Assistant - Text Testing Interface</p>
-        </div>
-        
-        <div class="status-bar">
-            <div class="status-indicator">
-                <span class="status-dot"></span>
-                <span id="statusText">Connecting...</span>
-            </div>
-            <div>
-                <span>Sessions: <strong id="sessionCount">0</strong></span>
-            </div>
-        </div>
-        
-        <div class="chat-container">
-            <div class="messages" id="messages">
-                <!-- Messages will appear here -->
-            </div>
-            
-            <div class="input-area">
-                <div class="input-container">
-                    <input 
-                        type="text" 
-                        id="messageInput" 
-                        placeholder="Scrivi il tuo messaggio..." 
-                        disabled
-                    >
-                    <button id="sendButton" disabled>Invia</button>
-                </div>
-            </div>
-        </div>
-
-        <script>
-            let ws = null;
-            let isConnected = false;
-            let currentAssistantMessage = '';
-
-            function connect() {
-                const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-                const wsUrl = `${protocol}//${window.location.host}/ws`;
-
-                console.log('Connecting to:', wsUrl);
-                ws = new WebSocket(wsUrl);
-
-                ws.onopen = () => {
-                    console.log('WebSocket connected');
-                    isConnected = true;
-                    document.getElementById('statusText').textContent = 'Connected';
-                    document.getElementById('messageInput').disabled = false;
-                    document.getElementById('sendButton').disabled = false;
-                    document.getElementById('messageInput').focus();
-                };
-
-                ws.onmessage = (event) => {
-                    const data = JSON.parse(event.data);
-                    console.log('Received:', data);
-
-                    if (data.type === 'system_ready') {
-                        addSystemMessage(`✅ Info Agent ready`);
-                    }
-                    else if (data.type === 'assistant_message_chunk') {
-                        // Streaming chunks from LLM - accumulate
-                        currentAssistantMessage += data.text;
-                        updateAssistantMessage(currentAssistantMessage);
-                    }
-                    else if (data.type === 'assistant_message_complete') {
-                        // Complete message - finalize and reset
-                        finalizeAssistantMessage(currentAssistantMessage);
-                        currentAssistantMessage = '';
-                    }
-                    else if (data.type === 'assistant_message') {
-                        // Single complete message (fallback)
-                        currentAssistantMessage = '';
-                        addMessage('assistant', data.text);
-                    }
-                };
-
-                ws.onerror = (error) => {
-                    console.error('WebSocket error:', error);
-                    document.getElementById('statusText').textContent = 'Error';
-                };
-
-                ws.onclose = () => {
-                    console.log('Disconnected');
-                    isConnected = false;
-                    document.getElementById('statusText').textContent = 'Disconnected';
-                    document.getElementById('messageInput').disabled = true;
-                    document.getElementById('sendButton').disabled = true;
-                };
-            }
-            
-            function sendMessage() {
-                const text = document.getElementById('messageInput').value.trim();
-
-                if (!text || !isConnected) return;
-
-                addMessage('user', text);
-
-                ws.send(JSON.stringify({
-                    type: 'user_message',
-                    text: text
-                }));
-
-                document.getElementById('messageInput').value = '';
-                showTypingIndicator();
-            }
-            
-            function addMessage(role, text) {
-                const messagesDiv = document.getElementById('messages');
-
-                const messageDiv = document.createElement('div');
-                messageDiv.className = `message ${role}`;
-
-                const icon = document.createElement('div');
-                icon.className = 'message-icon';
-                icon.textContent = role === 'user' ? '👤' : '🏥';
-
-                const bubble = document.createElement('div');
-                bubble.className = 'message-bubble';
-                bubble.textContent = text;
-
-                messageDiv.appendChild(icon);
-                messageDiv.appendChild(bubble);
-
-                // Remove typing indicator if exists
-                const typingIndicator = document.querySelector('.typing-indicator');
-                if (typingIndicator) {
-                    typingIndicator.remove();
-                }
-
-                messagesDiv.appendChild(messageDiv);
-                scrollToBottom();
-            }
-
-            function updateAssistantMessage(text) {
-                let messageDiv = document.querySelector('.message.assistant.streaming');
-
-                if (!messageDiv) {
-                    // Remove ALL typing indicators
-                    const typingIndicators = document.querySelectorAll('.message.assistant');
-                    typingIndicators.forEach(indicator => {
-                        if (indicator.querySelector('.typing-indicator')) {
-                            indicator.remove();
-                        }
-                    });
-
-                    // Create new streaming message
-                    messageDiv = document.createElement('div');
-                    messageDiv.className = 'message assistant streaming';
-
-                    const icon = document.createElement('div');
-                    icon.className = 'message-icon';
-                    icon.textContent = '🏥';
-
-                    const bubble = document.createElement('div');
-                    bubble.className = 'message-bubble';
-
-                    messageDiv.appendChild(icon);
-                    messageDiv.appendChild(bubble);
-
-                    document.getElementById('messages').appendChild(messageDiv);
-                }
-
-                const bubble = messageDiv.querySelector('.message-bubble');
-                bubble.textContent = text;
-                scrollToBottom();
-            }
-
-            function finalizeAssistantMessage(text) {
-                // Remove ALL streaming classes to ensure clean state
-                const allStreamingMessages = document.querySelectorAll('.message.assistant.streaming');
-                allStreamingMessages.forEach(msg => {
-                    msg.classList.remove('streaming');
-                });
-
-                // Reset the current message buffer
-                currentAssistantMessage = '';
-
-                // Ensure we scroll to bottom
-                scrollToBottom();
-            }
-
-            function showTypingIndicator() {
-                const indicator = document.createElement('div');
-                indicator.className = 'message assistant';
-                indicator.innerHTML = `
-                    <div class="message-icon">🏥</div>
-                    <div class="typing-indicator active">
-                        <span></span>
-                        <span></span>
-                        <span></span>
-                    </div>
-                `;
-                document.getElementById('messages').appendChild(indicator);
-                scrollToBottom();
-            }
-
-            function addSystemMessage(text) {
-                const messageDiv = document.createElement('div');
-                messageDiv.style.textAlign = 'center';
-                messageDiv.style.color = '#666';
-                messageDiv.style.fontSize = '12px';
-                messageDiv.style.margin = '15px 0';
-                messageDiv.style.fontStyle = 'italic';
-                messageDiv.textContent = text;
-                document.getElementById('messages').appendChild(messageDiv);
-                scrollToBottom();
-            }
-
-            function scrollToBottom() {
-                const container = document.getElementById('messages');
-                container.scrollTop = container.scrollHeight;
-            }
-            
-            // Event listeners
-            document.getElementById('sendButton').addEventListener('click', sendMessage);
-            
-            document.getElementById('messageInput').addEventListener('keypress', (e) => {
-                if (e.key === 'Enter' && !e.shiftKey) {
-                    e.preventDefault();
-                    sendMessage();
-                }
-            });
-            
-            // Connect on load
-            connect();
-        </script>
-    </body>
-    </html>
-    """)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=_CHAT_UI_GZIP,
+            media_type="text/html",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(content=_CHAT_UI_BYTES, media_type="text/html", headers={"Vary": "Accept-Encoding"})
 
 
 @app.get("/health")
@@ -674,9 +379,14 @@ async def websocket_endpoint(websocket: WebSocket):
     """
     global global_start_node
 
+    from pipecat.pipeline.pipeline import Pipeline
+    from pipecat.pipeline.runner import PipelineRunner
+    from pipecat.pipeline.task import PipelineParams, PipelineTask
+    from info_agent.flows.manager import create_flow_manager, initialize_flow_manager
+    from pipeline.components import create_llm_service, create_context_aggregator
+
     await websocket.accept()
 
-    import uuid
     session_id = f"info-chat-{uuid.uuid4().hex[:8]}"
 
     logger.info(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -739,13 +449,12 @@ async def websocket_endpoint(websocket: WebSocket):
         flow_manager.state["session_id"] = session_id
 
         # Store session
-        active_sessions[session_id] = {
-            "websocket": websocket,
-            "connected_at": asyncio.get_event_loop().time(),
-            "mode": "text-only",
-            "flow_manager": flow_manager,
-            "text_transport": text_transport
-        }
+        active_sessions[session_id] = ChatSession(
+            websocket=websocket,
+            connected_at=monotonic(),
+            flow_manager=flow_manager,
+            text_transport=text_transport
+        )
 
         # Initialize flow manager
         try:
@@ -753,10 +462,7 @@ async def websocket_endpoint(websocket: WebSocket):
             logger.success(f"✅ Flow initialized with {global_start_node} node")
 
             # Notify client that system is ready
-            await websocket.send_json({
-                "type": "system_ready",
-                "start_node": global_start_node
-            })
+            await websocket.send_bytes(system_ready_frame(global_start_node))
         except Exception as e:
             logger.error(f"Error during flow initialization: {e}")
 
@@ -764,45 +470,55 @@ async def websocket_endpoint(websocket: WebSocket):
         runner = PipelineRunner()
         logger.info(f"🚀 Text Chat Pipeline started for session: {session_id}")
 
-        # Run pipeline in background
-        pipeline_task = asyncio.create_task(runner.run(task))
-
-        # Handle incoming WebSocket messages
-        try:
-            while True:
-                # Receive message from WebSocket
-                message = await websocket.receive_json()
+        async def handle_messages():
+            """Forward incoming WebSocket messages to the pipeline until disconnect"""
+            try:
+                while websocket.client_state == WebSocketState.CONNECTED:
+                    # Receive message from WebSocket (binary or text JSON frames)
+                    user_text = parse_user_message(await receive_frame(websocket))
 
-                if message.get("type") == "user_message":
-                    user_text = message.get("text", "").strip()
+                    if user_text is not None:
+                        user_text = user_text.strip()
                     if user_text:
                         logger.info(f"💬 User: {user_text}")
 
                         # Send to pipeline
                         await text_transport.receive_text_message(user_text)
 
-        except WebSocketDisconnect:
-            logger.info(f"🔌 Text chat client disconnected: {session_id}")
-        except Exception as e:
-            logger.error(f"❌ Error in message loop: {e}")
+            except WebSocketDisconnect:
+                logger.info(f"🔌 Text chat client disconnected: {session_id}")
+            except Exception as e:
+                logger.error(f"❌ Error in message loop: {e}")
+            finally:
+                # Stop the pipeline so the task group can exit
+                await task.cancel()
+
+        # Run pipeline and message loop together. A disconnect ends the loop, which
+        # cancels the pipeline; a pipeline that ends on its own (e.g. EndFrame from
+        # the flow) leaves the loop blocked on receive, so cancel it here
+        runner_task = asyncio.create_task(runner.run(task))
+        receive_task = asyncio.create_task(handle_messages())
+        try:
+            await asyncio.wait({runner_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
         finally:
-            # Cancel pipeline
-            if pipeline_task:
-                pipeline_task.cancel()
-                try:
-                    await pipeline_task
-                except asyncio.CancelledError:
-                    pass
+            receive_task.cancel()
+            await asyncio.gather(receive_task, return_exceptions=True)
+
+        # Surfaces pipeline errors to the handler below
+        await runner_task
 
     except Exception as e:
-        logger.error(f"❌ Error in Text Chat WebSocket handler: {e}")
-        import traceback
-        traceback.print_exc()
+        # Traceback is attached to the record and formatted by the sink, not printed to stderr
+        logger.opt(exception=True).error(f"❌ Error in Text Chat WebSocket handler: {e}")
     finally:
         # Cleanup
         if session_id in active_sessions:
             del active_sessions[session_id]
 
+        # Release the queue consumer blocked on get()
+        if text_transport:
+            text_transport.stop()
+
         # Cancel task
         if task:
             await task.cancel()
@@ -875,7 +591,16 @@ def main():
     logger.info("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
     import uvicorn
-    uvicorn.run(app, host=args.host, port=args.port, reload=False)
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port,
+        reload=False,
+        loop="uvloop",       # Faster event loop for WebSocket send/receive
+        http="httptools",    # C HTTP parser instead of h11
+        ws="websockets",
+        ws_per_message_deflate=False  # Chat frames are tiny; compression only adds latency
+    )
 
 
 if __name__ == "__main__":
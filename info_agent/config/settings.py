@@ -4,103 +4,26 @@ Centralized settings for medical information assistant
 """
 
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
 from dotenv import load_dotenv
 from loguru import logger
 
-load_dotenv(override=True)
+# In production the orchestrator injects the environment (docker-compose sets
+# ENVIRONMENT=production and .env is not shipped), so skip the .env read there
+if os.getenv("ENVIRONMENT") != "production" and os.getenv("SKIP_DOTENV") != "1":
+    load_dotenv(override=True)
 
+# Environment snapshot taken once, right after .env is applied; settings read
+# from this plain dict instead of probing os.environ key by key
+_ENV = dict(os.environ)
 
-class InfoAgentSettings:
-  
-    
-    def __init__(self):
-        self._validate_api_endpoints()
-    
-    @property
-    def api_endpoints(self) -> Dict[str, str]:
-        """External API endpoints for info agent tools"""
-        return {
-            "knowledge_base_lombardia": os.getenv(
-                "KNOWLEDGE_BASE_LOMBARDIA_URL",
-                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/rag_lombardia"
-            ),
-            "exam_by_visit": os.getenv(
-                "EXAM_BY_VISIT_URL",
-                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/get_list_exam_by_visit"
-            ),
-            "exam_by_sport": os.getenv(
-                "EXAM_BY_SPORT_URL",
-                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/get_list_exam_by_sport"
-            ),
-            "get_price_non_agonistic_visit_lombardia": os.getenv(
-                "PRICE_NON_AGONISTIC_LOMBARDIA_URL",
-                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/get_price_non_agonistic_visit_lombardia"
-            ),
-            "price_agonistic": os.getenv(
-                "PRICE_AGONISTIC_URL",
-                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/get_price_agonistic_visit"
-            ),
-            "call_graph_lombardia": os.getenv(
-                "CALL_GRAPH_LOMBARDIA_URL",
-                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/graph_lombardia"
-            )
-        }
-    
-    @property
-    def agent_config(self) -> Dict[str, Any]:
-        """Agent personality and behavior configuration"""
-        return {
-            "name": "Ualà",
-            "organization": "Cerba HealthCare Group (Lombardy Region)",
-            "role": "Incoming Medical Information Support Agent",
-            "language": "Italian",
-            "personality": {
-                "tone": "warm and reassuring but professional",
-                "style": "short and conversational sentences",
-                "fillers": ["um...", "let's see...", "here..."],
-                "empathy": "active - recognize emotions, slow down for anxious callers"
-            },
-            "restrictions": [
-                "DO NOT book appointments",
-                "DO NOT provide medical advice",
-                "NEVER use own intrinsic knowledge - ALWAYS use functions",
-                "DO NOT say test/visit is not performed without checking",
-                "DO NOT respond to SSN/Agreement details"
-            ],
-            "services_offered": [
-                "Sports medicine visits (Agonisticaand non-competitive)",
-                "Laboratory diagnostics (blood tests and test panels)",
-                "Radiology services (X-rays, MRI, CT scan, ultrasound)",
-                "Outpatient clinic services (Orthopedic, Cardiology, Gastroenterology)"
-            ]
-        }
-    
-    @property
-    def system_prompt(self) -> str:
-        """
-        Static system prompt (backward compatibility)
-        For production, use get_system_prompt(business_status) instead
-        """
-        return self.get_system_prompt(business_status="open")
-
-    def get_system_prompt(self, business_status: str) -> str:
-        """
-        Generate dynamic system prompt for Ualà with business_status
-
-        Args:
-            business_status: Current business status from TalkDesk ("open" or "close") - REQUIRED
-
-        Returns:
-            Complete system prompt with injected business_status
-        """
-        if not business_status:
-            raise ValueError("business_status is required and must be provided by TalkDesk")
-
-        agent = self.agent_config
 
-        return f"""
-**Business Status**: {business_status.upper()}
+# System prompt for Ualà. Plain str (not an f-string): the only dynamic slot,
+# {BUSINESS_STATUS}, is filled with str.replace by InfoAgentSettings
+_SYSTEM_PROMPT_TEMPLATE = """
+**Business Status**: {BUSINESS_STATUS}
 ## *1. Role & Language*
 
 * Voice agent for Serbà HealthCare Group (Lombardy).
@@ -226,46 +149,180 @@ Use *knowledge_base()* when the question fits ANY of these cases:
 * Only use the defined functions.
 * Italian only.
 """
+
+
+# Agent identity and behavior: fixed for the process, so built once (tuples, read-only maps)
+_AGENT_CONFIG = MappingProxyType({
+    "name": "Ualà",
+    "organization": "Cerba HealthCare Group (Lombardy Region)",
+    "role": "Incoming Medical Information Support Agent",
+    "language": "Italian",
+    "personality": MappingProxyType({
+        "tone": "warm and reassuring but professional",
+        "style": "short and conversational sentences",
+        "fillers": ("um...", "let's see...", "here..."),
+        "empathy": "active - recognize emotions, slow down for anxious callers"
+    }),
+    "restrictions": (
+        "DO NOT book appointments",
+        "DO NOT provide medical advice",
+        "NEVER use own intrinsic knowledge - ALWAYS use functions",
+        "DO NOT say test/visit is not performed without checking",
+        "DO NOT respond to SSN/Agreement details"
+    ),
+    "services_offered": (
+        "Sports medicine visits (Agonisticaand non-competitive)",
+        "Laboratory diagnostics (blood tests and test panels)",
+        "Radiology services (X-rays, MRI, CT scan, ultrasound)",
+        "Outpatient clinic services (Orthopedic, Cardiology, Gastroenterology)"
+    )
+})
+
+
+# Sports medicine visit type codes (insertion order kept for messages)
+_VISIT_TYPES = MappingProxyType({
+    "A1": "Visit Type A1",
+    "A2": "Visit Type A2",
+    "A3": "Visit Type A3",
+    "B1": "Visit Type B1",
+    "B2": "Visit Type B2",
+    "B3": "Visit Type B3",
+    "B4": "Visit Type B4",
+    "B5": "Visit Type B5"
+})
+_VISIT_TYPE_CODES = frozenset(_VISIT_TYPES)
+
+
+@lru_cache(maxsize=8)
+def _render_system_prompt(status: str) -> str:
+    """Render (once per status) the system prompt for a normalized, lower-case business status"""
+    return _SYSTEM_PROMPT_TEMPLATE.replace("{BUSINESS_STATUS}", status.upper())
+
+
+class InfoAgentSettings:
+    """
+    Info agent settings
+
+    Environment is loaded once at import, so env-derived values are built once
+    in __init__ and stored in slots; the properties are plain slot reads.
+    """
+
+    __slots__ = ("_api_endpoints", "_server_config", "_api_timeout")
+
+    # business_status values TalkDesk sends; their prompts are rendered in __init__
+    KNOWN_BUSINESS_STATUSES = ("open", "close")
+
+    def __init__(self):
+        self._api_endpoints = self._load_api_endpoints()
+        self._server_config = self._load_server_config()
+        self._api_timeout = int(_ENV.get("API_TIMEOUT", 30))
+        self._validate_api_endpoints()
+        for status in self.KNOWN_BUSINESS_STATUSES:
+            _render_system_prompt(status)
+
+    @property
+    def api_endpoints(self) -> Mapping[str, str]:
+        """External API endpoints for info agent tools (read-only)"""
+        return self._api_endpoints
+
+    @staticmethod
+    def _load_api_endpoints() -> Mapping[str, str]:
+        """Build the endpoint map from the environment snapshot"""
+        return MappingProxyType({
+            "knowledge_base_lombardia": _ENV.get(
+                "KNOWLEDGE_BASE_LOMBARDIA_URL",
+                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/rag_lombardia"
+            ),
+            "exam_by_visit": _ENV.get(
+                "EXAM_BY_VISIT_URL",
+                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/get_list_exam_by_visit"
+            ),
+            "exam_by_sport": _ENV.get(
+                "EXAM_BY_SPORT_URL",
+                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/get_list_exam_by_sport"
+            ),
+            "get_price_non_agonistic_visit_lombardia": _ENV.get(
+                "PRICE_NON_AGONISTIC_LOMBARDIA_URL",
+                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/get_price_non_agonistic_visit_lombardia"
+            ),
+            "price_agonistic": _ENV.get(
+                "PRICE_AGONISTIC_URL",
+                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/get_price_agonistic_visit"
+            ),
+            "call_graph_lombardia": _ENV.get(
+                "CALL_GRAPH_LOMBARDIA_URL",
+                "https://voilavoiceagent-cyf2e9bshnguaebh.westeurope-01.azurewebsites.net/lombardia/graph_lombardia"
+            )
+        })
+    
+    @property
+    def agent_config(self) -> Mapping[str, Any]:
+        """Agent personality and behavior configuration (read-only)"""
+        return _AGENT_CONFIG
+    
+    @property
+    def system_prompt(self) -> str:
+        """
+        Static system prompt (backward compatibility)
+        For production, use get_system_prompt(business_status) instead
+        """
+        return self.get_system_prompt(business_status="open")
+
+    def get_system_prompt(self, business_status: str) -> str:
+        """
+        Generate dynamic system prompt for Ualà with business_status
+
+        Args:
+            business_status: Current business status from TalkDesk ("open" or "close") - REQUIRED
+
+        Returns:
+            Complete system prompt with injected business_status
+        """
+        status = business_status.strip().lower() if business_status else ""
+        if not status:
+            raise ValueError("business_status is required and must be provided by TalkDesk")
+
+        if status not in self.KNOWN_BUSINESS_STATUSES:
+            logger.warning(f"⚠️ Unexpected business_status '{business_status}' - rendering prompt as-is")
+
+        return _render_system_prompt(status)
     
     @property
-    def server_config(self) -> Dict[str, Any]:
-        """Server configuration"""
-        return {
-            "port": int(os.getenv("INFO_AGENT_PORT", 8081)),
-            "host": os.getenv("INFO_AGENT_HOST", "0.0.0.0"),
+    def server_config(self) -> Mapping[str, Any]:
+        """Server configuration (read-only)"""
+        return self._server_config
+
+    @staticmethod
+    def _load_server_config() -> Mapping[str, Any]:
+        """Build the server configuration from the environment snapshot"""
+        return MappingProxyType({
+            "port": int(_ENV.get("INFO_AGENT_PORT", 8081)),
+            "host": _ENV.get("INFO_AGENT_HOST", "0.0.0.0"),
             "title": "Info Agent - Medical Information Assistant",
             "version": "1.0.0",
             "session_timeout": 900  # 15 minutes (same as booking agent)
-        }
+        })
     
     @property
     def api_timeout(self) -> int:
         """Timeout for external API calls in seconds"""
-        return int(os.getenv("API_TIMEOUT", 30))
+        return self._api_timeout
     
     @property
-    def visit_types(self) -> Dict[str, str]:
-        """Sports medicine visit type codes"""
-        return {
-            "A1": "Visit Type A1",
-            "A2": "Visit Type A2",
-            "A3": "Visit Type A3",
-            "B1": "Visit Type B1",
-            "B2": "Visit Type B2",
-            "B3": "Visit Type B3",
-            "B4": "Visit Type B4",
-            "B5": "Visit Type B5"
-        }
+    def visit_types(self) -> Mapping[str, str]:
+        """Sports medicine visit type codes (read-only)"""
+        return _VISIT_TYPES
+
+    @property
+    def visit_type_codes(self) -> frozenset:
+        """Valid visit type codes, for O(1) membership checks"""
+        return _VISIT_TYPE_CODES
     
     def _validate_api_endpoints(self) -> None:
         """Validate that API endpoints are configured"""
-        endpoints = self.api_endpoints
-        
-        missing_endpoints = []
-        for endpoint_name, endpoint_url in endpoints.items():
-            if not endpoint_url:
-                missing_endpoints.append(endpoint_name)
-        
+        # Defaults are non-empty, so only an explicit VAR="" can leave one blank
+        missing_endpoints = [name for name, url in self._api_endpoints.items() if not url]
+
         if missing_endpoints:
             logger.warning(
                 f"⚠️ Missing API endpoint configurations: {', '.join(missing_endpoints)}\n"
@@ -32,36 +32,39 @@ async def create_admin_user():
         conn = await asyncpg.connect(dsn=database_url)
         print("✅ Connected to PostgreSQL")
         
-        # Check if user already exists
-        existing = await conn.fetchrow(
-            "SELECT user_id FROM users WHERE email = $1",
-            email
-        )
-        
-        if existing:
-            print(f"⚠️ User {email} already exists!")
-            print(f"   User ID: {existing['user_id']}")
-            print("\nYou can login with:")
-            print(f"   Email: {email}")
-            print(f"   Password: {password}")
-            await conn.close()
-            return
+        # Hash password off the event loop (cost configurable for dev/test)
+        rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+        salt = bcrypt.gensalt(rounds=rounds)
+        password_hash = (
+            await asyncio.to_thread(bcrypt.hashpw, password.encode('utf-8'), salt)
+        ).decode('utf-8')
         
-        # Hash password
-        salt = bcrypt.gensalt()
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
-        
-        # Insert user
+        # Insert user (duplicate email detected by the unique constraint, no pre-check SELECT)
         current_time = datetime.now()
         user_id = await conn.fetchval(
             """
             INSERT INTO users (email, name, password_hash, role, region, is_active, created_at, updated_at)
             VALUES ($1, $2, $3, $4, $5, true, $6, $7)
+            ON CONFLICT (email) DO NOTHING
             RETURNING user_id
             """,
             email, name, password_hash, role, region, current_time, current_time
         )
         
+        if user_id is None:
+            # Conflict path only: look up the existing user's ID for the message
+            existing_id = await conn.fetchval(
+                "SELECT user_id FROM users WHERE email = $1",
+                email
+            )
+            print(f"⚠️ User {email} already exists!")
+            print(f"   User ID: {existing_id}")
+            print("\nYou can login with:")
+            print(f"   Email: {email}")
+            print(f"   Password: {password}")
+            await conn.close()
+            return
+        
         print(f"✅ Admin user created successfully!")
         print(f"   User ID: {user_id}")
         print(f"   Email: {email}")
@@ -5,11 +5,18 @@ Each handler calls its respective API and returns to greeting node for follow-up
 Enhanced with function call tracking for analytics.
 """
 
+import traceback
 from typing import Tuple, Dict, Any
 from loguru import logger
 
 from pipecat_flows import FlowManager, NodeConfig, FlowArgs
+from info_agent.flows.nodes.conversation import create_greeting_node
+from info_agent.flows.nodes.transfer import create_transfer_node
 from info_agent.services.call_data_extractor import get_call_extractor
+from info_agent.services.clinic_info_service import clinic_info_service
+from info_agent.services.exam_service import exam_service
+from info_agent.services.knowledge_base import knowledge_base_service
+from info_agent.services.pricing_service import pricing_service
 
 
 # ============================================================================
@@ -29,7 +36,6 @@ async def query_knowledge_base_handler(
 
         if not query:
             logger.warning("⚠️ Empty knowledge base query")
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": False,
                 "error": "No query provided"
@@ -38,7 +44,6 @@ async def query_knowledge_base_handler(
         logger.info(f"📚 Knowledge Base Query: {query[:100]}...")
 
         # Call knowledge base service
-        from info_agent.services.knowledge_base import knowledge_base_service
         result = await knowledge_base_service.query(query)
 
         if result.success:
@@ -55,7 +60,6 @@ async def query_knowledge_base_handler(
                 )
 
             # Return to greeting node for follow-up
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": True,
                 "query": query,
@@ -67,7 +71,6 @@ async def query_knowledge_base_handler(
             logger.error(f"❌ Knowledge base query failed: {result.error}")
 
             # Offer transfer if no answer found
-            from info_agent.flows.nodes.transfer import create_transfer_node
             return {
                 "success": False,
                 "error": result.error,
@@ -76,10 +79,8 @@ async def query_knowledge_base_handler(
 
     except Exception as e:
         logger.error(f"❌ Knowledge base handler error: {e}")
-        import traceback
         traceback.print_exc()
 
-        from info_agent.flows.nodes.transfer import create_transfer_node
         return {"success": False, "error": str(e)}, create_transfer_node()
 
 
@@ -116,7 +117,6 @@ async def get_competitive_pricing_handler(
         if missing_params:
             logger.warning(f"⚠️ Missing parameters for competitive pricing: {missing_params}")
             # Return to greeting - LLM will ask for missing params
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": False,
                 "missing_params": missing_params,
@@ -127,7 +127,6 @@ async def get_competitive_pricing_handler(
         logger.info(f"   Age: {age}, Gender: {gender}, Sport: {sport}, Region: {region}")
 
         # Call pricing service
-        from info_agent.services.pricing_service import pricing_service
         result = await pricing_service.get_competitive_price(age, gender, sport, region)
 
         if result.success:
@@ -144,7 +143,6 @@ async def get_competitive_pricing_handler(
                 )
 
             # Return to greeting node for follow-up
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": True,
                 "price": result.price,
@@ -158,7 +156,6 @@ async def get_competitive_pricing_handler(
             logger.error(f"❌ Competitive pricing failed: {result.error}")
 
             # Offer transfer on API failure
-            from info_agent.flows.nodes.transfer import create_transfer_node
             return {
                 "success": False,
                 "error": result.error
@@ -166,10 +163,8 @@ async def get_competitive_pricing_handler(
 
     except Exception as e:
         logger.error(f"❌ Competitive pricing handler error: {e}")
-        import traceback
         traceback.print_exc()
 
-        from info_agent.flows.nodes.transfer import create_transfer_node
         return {"success": False, "error": str(e)}, create_transfer_node()
 
 
@@ -191,7 +186,6 @@ async def get_non_competitive_pricing_handler(
         if ecg_under_stress is None:
             logger.warning("⚠️ Missing ECG preference for non-competitive pricing")
             # Return to greeting - LLM will ask
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": False,
                 "missing_params": ["ecg_under_stress"],
@@ -201,7 +195,6 @@ async def get_non_competitive_pricing_handler(
         logger.info(f"💰 Non-Competitive Pricing Query: ECG under stress = {ecg_under_stress}")
 
         # Call pricing service
-        from info_agent.services.pricing_service import pricing_service
         result = await pricing_service.get_non_competitive_price(ecg_under_stress)
 
         if result.success:
@@ -218,7 +211,6 @@ async def get_non_competitive_pricing_handler(
                 )
 
             # Return to greeting node for follow-up
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": True,
                 "price": result.price,
@@ -227,7 +219,6 @@ async def get_non_competitive_pricing_handler(
         else:
             logger.error(f"❌ Non-competitive pricing failed: {result.error}")
 
-            from info_agent.flows.nodes.transfer import create_transfer_node
             return {
                 "success": False,
                 "error": result.error
@@ -235,10 +226,8 @@ async def get_non_competitive_pricing_handler(
 
     except Exception as e:
         logger.error(f"❌ Non-competitive pricing handler error: {e}")
-        import traceback
         traceback.print_exc()
 
-        from info_agent.flows.nodes.transfer import create_transfer_node
         return {"success": False, "error": str(e)}, create_transfer_node()
 
 
@@ -259,7 +248,6 @@ async def get_exam_by_visit_handler(
 
         if not visit_type:
             logger.warning("⚠️ Missing visit_type for exam list")
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": False,
                 "missing_params": ["visit_type"],
@@ -269,7 +257,6 @@ async def get_exam_by_visit_handler(
         logger.info(f"📋 Exam List by Visit Type: {visit_type}")
 
         # Call exam service
-        from info_agent.services.exam_service import exam_service
         result = await exam_service.get_exams_by_visit_type(visit_type)
 
         if result.success:
@@ -286,7 +273,6 @@ async def get_exam_by_visit_handler(
                 )
 
             # Return to greeting node with extracted fields
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": True,
                 "visit_type": visit_type,
@@ -297,7 +283,6 @@ async def get_exam_by_visit_handler(
         else:
             logger.error(f"❌ Exam list by visit failed: {result.error}")
 
-            from info_agent.flows.nodes.transfer import create_transfer_node
             return {
                 "success": False,
                 "error": result.error
@@ -305,10 +290,8 @@ async def get_exam_by_visit_handler(
 
     except Exception as e:
         logger.error(f"❌ Exam by visit handler error: {e}")
-        import traceback
         traceback.print_exc()
 
-        from info_agent.flows.nodes.transfer import create_transfer_node
         return {"success": False, "error": str(e)}, create_transfer_node()
 
 
@@ -329,7 +312,6 @@ async def get_exam_by_sport_handler(
 
         if not sport:
             logger.warning("⚠️ Missing sport for exam list")
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": False,
                 "missing_params": ["sport"],
@@ -339,7 +321,6 @@ async def get_exam_by_sport_handler(
         logger.info(f"📋 Exam List by Sport: {sport}")
 
         # Call exam service
-        from info_agent.services.exam_service import exam_service
         result = await exam_service.get_exams_by_sport(sport)
 
         if result.success:
@@ -356,7 +337,6 @@ async def get_exam_by_sport_handler(
                 )
 
             # Return to greeting node with extracted fields
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": True,
                 "sport": sport,
@@ -367,7 +347,6 @@ async def get_exam_by_sport_handler(
         else:
             logger.error(f"❌ Exam list by sport failed: {result.error}")
 
-            from info_agent.flows.nodes.transfer import create_transfer_node
             return {
                 "success": False,
                 "error": result.error
@@ -375,10 +354,8 @@ async def get_exam_by_sport_handler(
 
     except Exception as e:
         logger.error(f"❌ Exam by sport handler error: {e}")
-        import traceback
         traceback.print_exc()
 
-        from info_agent.flows.nodes.transfer import create_transfer_node
         return {"success": False, "error": str(e)}, create_transfer_node()
 
 
@@ -402,7 +379,6 @@ async def get_clinic_info_handler(
         if not query:
             logger.warning("⚠️ Missing query for clinic info")
             # Return to greeting - LLM will ask
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": False,
                 "missing_params": ["query"],
@@ -412,7 +388,6 @@ async def get_clinic_info_handler(
         logger.info(f"🏥 Clinic Info Query: {query}")
 
         # Call clinic info service with natural language query
-        from info_agent.services.clinic_info_service import clinic_info_service
         result = await clinic_info_service.get_clinic_info(query)
 
         if result.success:
@@ -429,7 +404,6 @@ async def get_clinic_info_handler(
                 )
 
             # Return to greeting node for follow-up
-            from info_agent.flows.nodes.conversation import create_greeting_node
             return {
                 "success": True,
                 "query": query,
@@ -438,7 +412,6 @@ async def get_clinic_info_handler(
         else:
             logger.error(f"❌ Clinic info failed: {result.error}")
 
-            from info_agent.flows.nodes.transfer import create_transfer_node
             return {
                 "success": False,
                 "error": result.error
@@ -446,8 +419,6 @@ async def get_clinic_info_handler(
 
     except Exception as e:
         logger.error(f"❌ Clinic info handler error: {e}")
-        import traceback
         traceback.print_exc()
 
-        from info_agent.flows.nodes.transfer import create_transfer_node
         return {"success": False, "error": str(e)}, create_transfer_node()
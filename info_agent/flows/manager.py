@@ -3,6 +3,8 @@ Flow Manager
 Initializes and manages conversation flows for info agent
 """
 
+import importlib
+
 from pipecat_flows import FlowManager, ContextStrategy, ContextStrategyConfig
 from pipecat.pipeline.task import PipelineTask
 from pipecat.services.openai.llm import OpenAILLMService
@@ -73,3 +75,26 @@ async def initialize_flow_manager(
     from info_agent.flows.nodes.conversation import create_greeting_node
     await flow_manager.initialize(create_greeting_node(flow_manager))  # ✅ Pass flow_manager for business_status
     logger.success("✅ One-shot agent flow initialized with greeting node (all 6 tools available)")
+
+
+# Modules loaded lazily on the greeting path, imported up front by prewarm_greeting_path()
+_GREETING_PATH_MODULES = (
+    "info_agent.flows.handlers.api_handlers",
+    "info_agent.flows.handlers.transfer_handlers",
+)
+
+
+def prewarm_greeting_path() -> None:
+    """
+    Import the modules the greeting node and its tool handlers load lazily,
+    and build the default system prompt once, so the first session does not
+    pay for them on its first message.
+    """
+    # api_handlers pulls in the greeting/transfer nodes and the four API services
+    for module_name in _GREETING_PATH_MODULES:
+        importlib.import_module(module_name)
+
+    from info_agent.config.settings import info_settings
+
+    info_settings.get_system_prompt("open")
+    logger.info("🔥 Greeting flow path pre-warmed")
@@ -28,6 +28,30 @@ VALID_MOTIVAZIONE = {
 
 ALL_MOTIVAZIONI = [m for motiv_list in VALID_MOTIVAZIONE.values() for m in motiv_list]
 
+# UPDATE for the tb_stat row the bridge created (call_id = $1).
+# Kept as a single module-level string so every save sends identical SQL text.
+UPDATE_CALL_STAT_SQL = """
+UPDATE tb_stat SET
+    phone_number = $2,
+    assistant_id = $3,
+    region = $4,
+    started_at = $5,
+    ended_at = $6,
+    duration_seconds = $7,
+    action = $8,
+    sentiment = $9,
+    esito_chiamata = $10,
+    motivazione = $11,
+    patient_intent = $12,
+    transcript = $13,
+    summary = $14,
+    cost = $15,
+    llm_token = $16,
+    service = $17,
+    updated_at = CURRENT_TIMESTAMP
+WHERE call_id = $1
+"""
+
 
 def validate_and_fix_llm_output(analysis: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -704,30 +728,8 @@ TRANSCRIPT:
             }
 
             # UPDATE database row (bridge already created it with call_id)
-            query = """
-            UPDATE tb_stat SET
-                phone_number = $2,
-                assistant_id = $3,
-                region = $4,
-                started_at = $5,
-                ended_at = $6,
-                duration_seconds = $7,
-                action = $8,
-                sentiment = $9,
-                esito_chiamata = $10,
-                motivazione = $11,
-                patient_intent = $12,
-                transcript = $13,
-                summary = $14,
-                cost = $15,
-                llm_token = $16,
-                service = $17,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE call_id = $1
-            """
-
             result = await db.execute(
-                query,
+                UPDATE_CALL_STAT_SQL,
                 self.call_id,
                 phone_number,
                 self.assistant_id,
@@ -780,9 +782,10 @@ _active_extractors: Dict[str, CallDataExtractor] = {}
 
 def get_call_extractor(session_id: str) -> CallDataExtractor:
     """Get or create call data extractor for session"""
-    if session_id not in _active_extractors:
-        _active_extractors[session_id] = CallDataExtractor(session_id)
-    return _active_extractors[session_id]
+    extractor = _active_extractors.get(session_id)
+    if extractor is None:
+        extractor = _active_extractors[session_id] = CallDataExtractor(session_id)
+    return extractor
 
 
 def cleanup_call_extractor(session_id: str):
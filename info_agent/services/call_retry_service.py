@@ -17,6 +17,28 @@ from sendgrid.helpers.mail import Mail
 from info_agent.api.database import db
 from info_agent.utils.tracing import trace_api_call, add_span_attributes
 
+# Replays a backed-up call onto its tb_stat row (call_id = $1)
+RETRY_CALL_STAT_SQL = """
+UPDATE tb_stat SET
+    phone_number = $2,
+    assistant_id = $3,
+    started_at = $4,
+    ended_at = $5,
+    duration_seconds = $6,
+    action = $7,
+    sentiment = $8,
+    esito_chiamata = $9,
+    motivazione = $10,
+    patient_intent = $11,
+    transcript = $12,
+    summary = $13,
+    cost = $14,
+    llm_token = $15,
+    service = $16,
+    updated_at = CURRENT_TIMESTAMP
+WHERE call_id = $1
+"""
+
 
 class CallRetryService:
     """
@@ -36,6 +58,9 @@ class CallRetryService:
         self.sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
         self.alert_from_email = os.getenv("ALERT_FROM_EMAIL", "alerts@cerbacare.it")
         self.alert_to_emails = os.getenv("ALERT_TO_EMAILS", "").split(",")  # Comma-separated
+        # One client for the service lifetime so it isn't rebuilt for every alert
+        # (python_http_client still opens a fresh connection per send)
+        self.sendgrid_client = SendGridAPIClient(self.sendgrid_api_key) if self.sendgrid_api_key else None
 
         logger.info("📧 Call Retry Service initialized")
         logger.info(f"   Backup directory: {self.backup_dir}")
@@ -171,33 +196,12 @@ class CallRetryService:
             True if successful, False otherwise
         """
         try:
-            query = """
-            UPDATE tb_stat SET
-                phone_number = $2,
-                assistant_id = $3,
-                started_at = $4,
-                ended_at = $5,
-                duration_seconds = $6,
-                action = $7,
-                sentiment = $8,
-                esito_chiamata = $9,
-                motivazione = $10,
-                patient_intent = $11,
-                transcript = $12,
-                summary = $13,
-                cost = $14,
-                llm_token = $15,
-                service = $16,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE call_id = $1
-            """
-
             # Parse timestamps
             started_at = datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None
             ended_at = datetime.fromisoformat(data["ended_at"]) if data.get("ended_at") else None
 
             result = await db.execute(
-                query,
+                RETRY_CALL_STAT_SQL,
                 data["call_id"],
                 data.get("phone_number"),
                 data.get("assistant_id"),
@@ -247,7 +251,7 @@ class CallRetryService:
         })
 
         try:
-            if not self.sendgrid_api_key:
+            if not self.sendgrid_client:
                 logger.error("❌ SendGrid API key not configured, cannot send alert")
                 return
 
@@ -293,30 +297,41 @@ class CallRetryService:
             </html>
             """
 
-            # Send to all configured emails
-            for to_email in self.alert_to_emails:
-                if not to_email:
-                    continue
-
-                message = Mail(
-                    from_email=self.alert_from_email,
-                    to_emails=to_email,
-                    subject=subject,
-                    html_content=html_content
-                )
-
-                sg = SendGridAPIClient(self.sendgrid_api_key)
-                response = sg.send(message)
+            # Send to all configured emails concurrently (each SendGrid call runs in a thread);
+            # one failing recipient must not cancel the alerts to the others
+            recipients = [e for e in self.alert_to_emails if e]
+            results = await asyncio.gather(
+                *(self._send_alert_email(to_email, subject, html_content) for to_email in recipients),
+                return_exceptions=True
+            )
 
-                logger.info(f"📧 Alert email sent to {to_email} (status: {response.status_code})")
+            failed = 0
+            for to_email, result in zip(recipients, results):
+                if isinstance(result, BaseException):
+                    failed += 1
+                    logger.error(f"❌ Failed to send alert email to {to_email}: {result}")
 
-            logger.success(f"✅ Failure alert sent for call {call_id}")
+            if failed < len(recipients):
+                logger.success(f"✅ Failure alert sent for call {call_id} ({len(recipients) - failed}/{len(recipients)} recipients)")
 
         except Exception as e:
             logger.error(f"❌ Failed to send alert email: {e}")
             import traceback
             traceback.print_exc()
 
+    async def _send_alert_email(self, to_email: str, subject: str, html_content: str):
+        """Send a single alert email without blocking the event loop"""
+        message = Mail(
+            from_email=self.alert_from_email,
+            to_emails=to_email,
+            subject=subject,
+            html_content=html_content
+        )
+
+        response = await asyncio.to_thread(self.sendgrid_client.send, message)
+
+        logger.info(f"📧 Alert email sent to {to_email} (status: {response.status_code})")
+
 
 # Global instance
 _retry_service: Optional[CallRetryService] = None
@@ -61,16 +61,15 @@ class ExamService:
             await self.initialize()
             
             # Validate visit type
-            valid_types = ["A1", "A2", "A3", "B1", "B2", "B3", "B4", "B5"]
             visit_type = visit_type.upper()
             
-            if visit_type not in valid_types:
+            if visit_type not in info_settings.visit_type_codes:
                 logger.warning(f"⚠️ Invalid visit type '{visit_type}'")
                 return ExamResult(
                     exams=[],
                     visit_type=visit_type,
                     success=False,
-                    error=f"Invalid visit type. Must be one of: {', '.join(valid_types)}"
+                    error=f"Invalid visit type. Must be one of: {', '.join(info_settings.visit_types)}"
                 )
             
             logger.info(f"🔬 Getting exams for visit type: {visit_type}")
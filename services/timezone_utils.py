@@ -8,6 +8,10 @@ from zoneinfo import ZoneInfo
 from loguru import logger
 from typing import Optional
 
+# Resolved once at import; ZoneInfo lookups per call are wasted work on slot loops
+ITALIAN_TZ = ZoneInfo("Europe/Rome")
+UTC_TZ = ZoneInfo("UTC")
+
 
 def utc_to_italian_display(utc_datetime_str: str) -> Optional[str]:
     """
@@ -24,7 +28,7 @@ def utc_to_italian_display(utc_datetime_str: str) -> Optional[str]:
         dt_utc = datetime.fromisoformat(utc_datetime_str)
 
         # Convert to Italian timezone (handles DST automatically)
-        dt_italian = dt_utc.astimezone(ZoneInfo("Europe/Rome"))
+        dt_italian = dt_utc.astimezone(ITALIAN_TZ)
 
         # Format for display (same format as current system uses)
         italian_display = dt_italian.strftime("%Y-%m-%d %H:%M:%S")
@@ -53,10 +57,10 @@ def italian_to_utc_for_api(italian_datetime_str: str) -> Optional[str]:
         dt_italian = datetime.strptime(italian_datetime_str, "%Y-%m-%d %H:%M:%S")
 
         # Set timezone to Italy (handles DST automatically)
-        dt_italian = dt_italian.replace(tzinfo=ZoneInfo("Europe/Rome"))
+        dt_italian = dt_italian.replace(tzinfo=ITALIAN_TZ)
 
         # Convert back to UTC
-        dt_utc = dt_italian.astimezone(ZoneInfo("UTC"))
+        dt_utc = dt_italian.astimezone(UTC_TZ)
 
         # Format for booking API (same format as current system expects)
         utc_for_api = dt_utc.strftime("%Y-%m-%d %H:%M:%S")
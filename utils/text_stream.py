@@ -0,0 +1,99 @@
+"""
+Text streaming utilities
+Coalesces streamed LLM text chunks into fewer, larger WebSocket sends
+"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+
+class TextChunkCoalescer:
+    """
+    Batch streamed text chunks before sending them
+
+    Pending text is sent as one chunk after `interval` seconds or as soon as
+    it reaches `max_chars`, whichever comes first. Used by the text chat
+    testers so a token-by-token LLM stream doesn't cost one frame per token.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        interval: float = 0.015,
+        max_chars: int = 32,
+    ):
+        """
+        Args:
+            send: Coroutine called with the joined pending text
+            interval: Max seconds a chunk waits before being sent
+            max_chars: Pending size that triggers an immediate send
+        """
+        self._send = send
+        self._interval = interval
+        self._max_chars = max_chars
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Timed flushes run as tasks; keep a reference so they can't be
+        # garbage-collected before finishing
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def add(self, text: str):
+        """Queue a chunk, sending right away if enough text is pending"""
+        self._pending.append(text)
+        self._pending_chars += len(text)
+
+        if self._pending_chars >= self._max_chars:
+            await self.flush()
+        elif self._flush_handle is None and self._flush_task is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self._interval, self._start_timed_flush)
+
+    async def flush(self):
+        """Send everything pending now (waits for an in-flight timed flush first)"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        # Let a timed flush already sending finish so chunks stay in order
+        if self._flush_task is not None:
+            await self._flush_task
+
+        await self._drain()
+
+    def cancel(self):
+        """Drop pending text and any scheduled flush (e.g. on disconnect)"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # Called from a send inside the timed flush itself: let that task finish
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._pending.clear()
+        self._pending_chars = 0
+
+    def _start_timed_flush(self):
+        """Timer callback: run the flush as a tracked task"""
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self._timed_flush())
+
+    async def _timed_flush(self):
+        try:
+            await self._drain()
+        finally:
+            self._flush_task = None
+            # Chunks added while this flush was sending scheduled no timer; arm
+            # one now so they still go out within `interval`
+            if self._pending and self._flush_handle is None:
+                loop = asyncio.get_running_loop()
+                self._flush_handle = loop.call_later(self._interval, self._start_timed_flush)
+
+    async def _drain(self):
+        if not self._pending:
+            return
+
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        await self._send(text)